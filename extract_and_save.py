@@ -1,11 +1,27 @@
+from __future__ import annotations
+
 import os
 import pdfplumber
 from pathlib import Path
 import sys
-import math
 import argparse
-from typing import List, Tuple
+import bisect
+import contextlib
+import io
+import itertools
+import mmap
 import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from collections import deque
+from collections.abc import Iterator
+
+# PyMuPDF извлекает текст в несколько раз быстрее pdfplumber;
+# если он не установлен, используется только pdfplumber
+try:
+    import pymupdf
+except ImportError:
+    pymupdf = None
 
 # Set UTF-8 encoding for output
 sys.stdout.reconfigure(encoding='utf-8') if hasattr(sys.stdout, 'reconfigure') else None
@@ -15,70 +31,148 @@ MAX_CHARS_PER_PART = 50000  # Максимальное количество си
 MIN_PARTS = 2  # Минимальное количество частей
 MAX_PARTS = 3  # Максимальное количество частей
 
+# Настройки параллельного извлечения страниц
+PARALLEL_PAGES_THRESHOLD = 20  # Минимальное количество страниц для параллельного извлечения
+PARALLEL_CHUNK_PAGES = 50  # Максимальное количество страниц в одном диапазоне рабочего процесса
+
+# Размер буфера записи выходных файлов
+WRITE_BUFFER_SIZE = 1 << 20  # 1 МБ
+WRITE_QUEUE_PAGES = 64  # Максимальное количество страниц в очереди фоновой записи
+
+# Постоянные части заголовка страницы "\n--- Страница N ---\n", заранее закодированные в UTF-8
+_PAGE_HEADER_PREFIX = "\n--- Страница ".encode('utf-8')
+_PAGE_HEADER_SUFFIX = b" ---\n"
+_PAGE_HEADER_CHARS = len("\n--- Страница ") + len(" ---\n")
+
+def _get_max_workers() -> int:
+    """
+    Возвращает максимальное количество рабочих процессов.
+    """
+    return min(os.cpu_count() or 1, 8)
+
+# Таблица замены недопустимых в именах файлов символов на "_"
+_FNAME_TRANS = str.maketrans({c: "_" for c in '<>:"/\\|?*'})
+
 def sanitize_filename(filename: str) -> str:
     """
     Очищает имя файла от недопустимых символов.
     """
-    # Удаляем недопустимые символы для Windows/Linux
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-    # Удаляем лишние пробелы
-    filename = re.sub(r'\s+', ' ', filename).strip()
-    return filename
+    # Заменяем недопустимые символы для Windows/Linux и схлопываем лишние пробелы
+    return " ".join(filename.translate(_FNAME_TRANS).split())
+
+# Имя вида "имя_частьK_изN", которое получают части разделенного документа
+_PART_NAME_RE = re.compile(r"(.*)_часть\d+_из\d+", re.IGNORECASE)
 
-def split_text_into_parts(text: str, num_parts: int) -> List[str]:
+def build_output_names(pdf_files: list[Path]) -> list[str]:
     """
-    Разделяет текст на указанное количество частей, стараясь не разрывать абзацы.
+    Заранее вычисляет очищенные базовые имена выходных файлов для всех PDF.
+    Совпадающие имена (например, при рекурсивном поиске) получают номер " (N)",
+    чтобы параллельные процессы не писали в один и тот же файл. Номер получает
+    и PDF с именем вида "имя_частьK_изN", если так может называться часть
+    другого документа "имя".
     """
-    if not text.strip():
-        return [text]
-    
-    # Разбиваем текст на абзацы
-    paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-    
-    # Если абзацев меньше, чем частей, используем простые разрывы
-    if len(paragraphs) < num_parts:
-        paragraphs = [p.strip() for p in text.split('\n') if p.strip()]
-    
-    if len(paragraphs) == 0:
-        return [text]
-    
-    total_chars = len(text)
-    chars_per_part = total_chars / num_parts
-    
-    parts = []
-    current_part = ""
-    current_chars = 0
-    target_chars = chars_per_part
-    
+    stems = [sanitize_filename(pdf_file.stem) for pdf_file in pdf_files]
+    # Сравниваем без учета регистра: на Windows "A.txt" и "a.txt" - один файл.
+    # Номера не должны совпадать с собственными именами других PDF
+    reserved = {stem.lower() for stem in stems}
+    taken = set()
+    
+    def is_taken(name: str) -> bool:
+        match = _PART_NAME_RE.fullmatch(name)
+        return name.lower() in taken or (match is not None and match.group(1).lower() in taken)
+    
+    # Имена, похожие на имена частей, назначаем последними и от коротких к длинным,
+    # чтобы к их проверке имена документов, чьими частями они могут быть, уже были заняты
+    order = sorted(range(len(stems)), key=lambda i: (0, 0) if _PART_NAME_RE.fullmatch(stems[i]) is None else (1, len(stems[i])))
+    names = [""] * len(stems)
+    for i in order:
+        name = stems[i]
+        count = 1
+        while is_taken(name) or (count > 1 and name.lower() in reserved):
+            count += 1
+            name = f"{stems[i]} ({count})"
+        taken.add(name.lower())
+        names[i] = name
+    return names
+
+def _split_block_text(text: str, max_chars: int) -> list[str]:
+    """
+    Делит текст блока на куски по границам абзацев (\n\n), а абзацы длиннее
+    max_chars - по строкам. Куски в сумме дают исходный текст без изменений;
+    пустые строки присоединяются к предыдущему куску.
+    """
+    paragraphs = text.split('\n\n')
+    pieces = []
     for i, paragraph in enumerate(paragraphs):
-        para_chars = len(paragraph)
-        
-        # Если добавление абзаца не превысит лимит, добавляем его
-        # Или если это последняя часть - добавляем все оставшееся
-        if current_chars + para_chars <= target_chars or len(parts) == num_parts - 1:
-            if current_part:
-                current_part += "\n\n"
-            current_part += paragraph
-            current_chars += para_chars + 2  # +2 за \n\n
+        if i < len(paragraphs) - 1:
+            paragraph += '\n\n'
+        for piece in [paragraph] if len(paragraph) <= max_chars else paragraph.splitlines(keepends=True):
+            if pieces and (not piece or piece.isspace()):
+                pieces[-1] += piece
+            elif piece:
+                pieces.append(piece)
+    return pieces
+
+def split_oversized_blocks(src, lengths: list[int], sizes: list[int], max_chars: float) -> tuple[list[int], list[int]]:
+    """
+    Делит блоки страниц длиннее max_chars на более мелкие куски с помощью
+    _split_block_text, чтобы одна большая страница не оказывалась целиком в одной части.
+    Текст таких блоков по одному читается из UTF-8 файла src, куда они были записаны;
+    заголовок страницы остается в первом куске.
+    Возвращает: (длины кусков в символах, размеры кусков в байтах)
+    """
+    piece_lengths: list[int] = []
+    piece_sizes: list[int] = []
+    offset = 0
+    for length, size in zip(lengths, sizes):
+        if length <= max_chars:
+            piece_lengths.append(length)
+            piece_sizes.append(size)
         else:
-            # Сохраняем текущую часть и начинаем новую
-            if current_part:
-                parts.append(current_part.strip())
-            current_part = paragraph
-            current_chars = para_chars
-            target_chars = chars_per_part * (len(parts) + 1)
-    
-    # Добавляем последнюю часть
-    if current_part:
-        parts.append(current_part.strip())
+            src.seek(offset)
+            text = src.read(size).decode('utf-8')
+            # Заголовок страницы ("\n--- Страница N ---\n") не отрываем от начала ее текста
+            header_end = text.index('\n', 1) + 1
+            pieces = _split_block_text(text[header_end:], int(max_chars))
+            pieces[0] = text[:header_end] + pieces[0]
+            for piece in pieces:
+                piece_lengths.append(len(piece))
+                piece_sizes.append(len(piece.encode('utf-8')))
+        offset += size
+    return piece_lengths, piece_sizes
+
+def split_points(lengths: list[int], num_parts: int) -> list[int]:
+    """
+    Делит последовательность блоков заданной длины на num_parts
+    непрерывных частей примерно равного размера, не разрывая блоки.
+    Если блоков меньше, чем частей, последние части остаются пустыми.
+    Возвращает num_parts + 1 границ: от 0 до len(lengths).
+    """
+    # Позиции начала каждого блока: pos[k] - суммарная длина первых k блоков
+    pos = [0, *itertools.accumulate(lengths)]
+    total_chars = pos[-1]
+    
+    # Для каждой равномерной целевой позиции бинарным поиском находим
+    # ближайшую к ней границу между блоками
+    points = [0]
+    start = 0
+    for i in range(1, num_parts):
+        target = total_chars * i / num_parts
+        end = bisect.bisect_left(pos, target, lo=start)
+        if end > start and target - pos[end - 1] < pos[end] - target:
+            end -= 1
+        # Каждая часть получает хотя бы один блок, пока их хватает на оставшиеся части
+        if len(lengths) - start > num_parts - i:
+            end = min(max(end, start + 1), len(lengths) - (num_parts - i))
+        else:
+            end = min(start + 1, len(lengths))
+        points.append(end)
+        start = end
     
-    # Убеждаемся, что получили нужное количество частей
-    if len(parts) < num_parts and len(parts) > 0:
-        # Если получилось меньше частей, равномерно распределяем
-        while len(parts) < num_parts:
-            parts.append("")
+    # Последняя часть получает все оставшиеся блоки
+    points.append(len(lengths))
     
-    return parts[:num_parts]  # Ограничиваем максимальным количеством
+    return points
 
 def determine_num_parts(text_length: int, max_chars_per_part: int, min_parts: int, max_parts: int) -> int:
     """
@@ -88,77 +182,312 @@ def determine_num_parts(text_length: int, max_chars_per_part: int, min_parts: in
         return 1  # Не нужно разделять
     
     # Вычисляем минимальное необходимое количество частей
-    min_required = math.ceil(text_length / max_chars_per_part)
+    min_required = -(-text_length // max_chars_per_part)
     
     # Ограничиваем между min_parts и max_parts
     num_parts = max(min_parts, min(min_required, max_parts))
     
     return num_parts
 
-def extract_text_from_pdf(pdf_path: Path) -> Tuple[str, int, str]:
+def _open_pdfplumber_mmap(pdf_path: Path) -> pdfplumber.PDF:
     """
-    Извлекает текст из PDF файла.
-    Возвращает: (текст, количество страниц, сообщение об ошибке)
+    Открывает PDF через pdfplumber поверх отображения файла в память (mmap),
+    чтобы pdfminer при разрешении ссылок на объекты читал их прямо из
+    страничного кэша ОС, а не множеством мелких вызовов read().
     """
-    full_text = ""
-    total_pages = 0
-    error_msg = None
+    with open(pdf_path, 'rb') as fh:
+        # Пустой файл отобразить нельзя ("cannot mmap an empty file") - сообщаем понятнее
+        if os.fstat(fh.fileno()).st_size == 0:
+            raise ValueError("файл пустой (0 байт)")
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        # Документ владеет отображением и закрывает его вместе с собой
+        return pdfplumber.PDF(mm)
+    except Exception:
+        mm.close()
+        raise
+
+def _open_pdf(pdf_path: Path, use_pymupdf: bool):
+    """
+    Открывает PDF через PyMuPDF или pdfplumber.
+    """
+    if use_pymupdf:
+        return pymupdf.open(pdf_path)
+    return _open_pdfplumber_mmap(pdf_path)
+
+def _page_count(doc) -> int:
+    """
+    Возвращает количество страниц документа, открытого через _open_pdf.
+    """
+    if isinstance(doc, pdfplumber.PDF):
+        return len(doc.pages)
+    return doc.page_count
+
+def _extract_page_text(doc, page_index: int) -> str | None:
+    """
+    Извлекает текст одной страницы документа, открытого через _open_pdf.
+    """
+    if not isinstance(doc, pdfplumber.PDF):
+        return doc.load_page(page_index).get_text("text")
     
+    page = doc.pages[page_index]
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            total_pages = len(pdf.pages)
-            
-            for page_num, page in enumerate(pdf.pages, 1):
-                try:
-                    text = page.extract_text()
-                    if text and text.strip():
-                        full_text += f"\n--- Страница {page_num} ---\n"
-                        full_text += text
-                        full_text += "\n"
-                except Exception as e:
-                    error_msg = f"Ошибка при извлечении текста со страницы {page_num}: {e}"
-                    print(f"  ⚠️  {error_msg}")
-            
-            if not full_text.strip():
-                error_msg = "PDF не содержит текста (возможно, это сканированное изображение)"
-                
+        return page.extract_text()
+    finally:
+        # Освобождаем разобранные объекты страницы: документ остается открытым,
+        # и его кэш шрифтов (pdf.rsrcmgr) переиспользуется следующими страницами
+        page.close()
+
+def _extract_pages(doc, start: int, stop: int) -> Iterator[tuple[int, str | None, str | None]]:
+    """
+    Извлекает текст со страниц [start, stop) открытого PDF.
+    Выдает (номер страницы, текст, сообщение об ошибке).
+    """
+    for page_num in range(start + 1, stop + 1):
+        try:
+            yield page_num, _extract_page_text(doc, page_num - 1), None
+        except Exception as e:
+            yield page_num, None, str(e)
+
+def extract_page_range(pdf_path: Path, start: int, stop: int, use_pymupdf: bool) -> list[tuple[int, str | None, str | None]]:
+    """
+    Открывает PDF в рабочем процессе и извлекает текст со страниц [start, stop).
+    """
+    with _open_pdf(pdf_path, use_pymupdf) as doc:
+        return list(_extract_pages(doc, start, stop))
+
+def _extract_pages_parallel(pdf_path: Path, total_pages: int, max_workers: int, use_pymupdf: bool) -> Iterator[tuple[int, str | None, str | None]]:
+    """
+    Распределяет страницы PDF по рабочим процессам непрерывными диапазонами
+    (не длиннее PARALLEL_CHUNK_PAGES страниц). Каждый процесс открывает PDF
+    самостоятельно, чтобы разбор документа выполнялся один раз на диапазон,
+    а не на каждую страницу.
+    Диапазоны выдаются по порядку страниц; одновременно в работе не больше
+    2 * max_workers диапазонов, а результат каждого отпускается сразу после выдачи,
+    так что в памяти не копится текст всего документа.
+    """
+    chunk_size = min(-(-total_pages // max_workers), PARALLEL_CHUNK_PAGES)
+    starts = iter(range(0, total_pages, chunk_size))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for start in itertools.islice(starts, 2 * max_workers):
+            pending.append(executor.submit(extract_page_range, pdf_path, start, min(start + chunk_size, total_pages), use_pymupdf))
+        while pending:
+            page_results = pending.popleft().result()
+            start = next(starts, None)
+            if start is not None:
+                pending.append(executor.submit(extract_page_range, pdf_path, start, min(start + chunk_size, total_pages), use_pymupdf))
+            yield from page_results
+
+def _open_pdf_with_fallback(pdf_path: Path) -> tuple[object, bool]:
+    """
+    Открывает PDF через PyMuPDF, а если он недоступен или не смог разобрать
+    файл - через pdfplumber. Если не справились оба, ошибка содержит
+    сообщения обоих.
+    Возвращает: (документ, открыт ли он через PyMuPDF)
+    """
+    use_pymupdf = pymupdf is not None
+    try:
+        return _open_pdf(pdf_path, use_pymupdf), use_pymupdf
     except Exception as e:
-        error_msg = f"Ошибка при открытии PDF: {e}"
-    
-    return full_text, total_pages, error_msg
+        if not use_pymupdf:
+            raise
+        pymupdf_error = e
+    try:
+        return _open_pdf(pdf_path, False), False
+    except Exception as e:
+        raise RuntimeError(f"PyMuPDF: {pymupdf_error}; pdfplumber: {e}") from pymupdf_error
+
+def is_text_pdf(doc) -> bool:
+    """
+    Быстро проверяет, содержит ли открытый PDF извлекаемый текст, по первой,
+    средней и последней страницам, не разбирая документ целиком.
+    Возвращает False для сканированных документов без текстового слоя.
+    """
+    total_pages = _page_count(doc)
+    for page_index in sorted({0, total_pages // 2, total_pages - 1} if total_pages else ()):
+        try:
+            text = _extract_page_text(doc, page_index)
+        except Exception:
+            return True  # По этой странице судить нельзя - выполняем полное извлечение
+        if text and not text.isspace():
+            return True
+    return False
 
-def process_pdf(pdf_file: Path, output_dir: Path, stats: dict, max_chars_per_part: int, min_parts: int, max_parts: int) -> None:
+def iter_pdf_pages(pdf_path: Path, doc, max_workers: int = 1) -> Iterator[tuple[int, str | None, str | None]]:
+    """
+    Последовательно выдает (номер страницы, текст, сообщение об ошибке) для всех
+    страниц документа doc, открытого через _open_pdf_with_fallback.
+    Большие документы (от PARALLEL_PAGES_THRESHOLD страниц) обрабатываются
+    параллельно в max_workers процессах, которые открывают pdf_path тем же способом.
+    """
+    total_pages = _page_count(doc)
+    if max_workers <= 1 or total_pages < PARALLEL_PAGES_THRESHOLD:
+        yield from _extract_pages(doc, 0, total_pages)
+    else:
+        use_pymupdf = not isinstance(doc, pdfplumber.PDF)
+        yield from _extract_pages_parallel(pdf_path, total_pages, max_workers, use_pymupdf)
+
+def extract_text_to_file(pdf_path: Path, doc, output_path: Path, max_workers: int = 1) -> tuple[list[int], list[int], int, str | None]:
+    """
+    Извлекает текст из открытого PDF и постранично записывает его в output_path
+    в кодировке UTF-8, не накапливая весь документ в памяти.
+    Запись выполняется в фоновом потоке, так что диск не простаивает,
+    пока извлекается следующая страница.
+    Возвращает: (длины блоков страниц в символах, размеры блоков в байтах,
+    количество страниц, сообщение об ошибке последней неудачной страницы)
+    Ошибки отдельных страниц только печатаются; если же сбой прерывает
+    извлечение документа целиком (например, упал рабочий процесс),
+    исключение пробрасывается, так как записанный текст неполон.
+    """
+    page_lengths: list[int] = []
+    page_sizes: list[int] = []
+    total_pages = _page_count(doc)
+    error_msg = None
+    writes = deque()
+    
+    # Поток записи завершается (дописывая очередь) раньше, чем закрывается файл
+    with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f, ThreadPoolExecutor(max_workers=1) as writer:
+        for page_num, text, page_error in iter_pdf_pages(pdf_path, doc, max_workers):
+            if page_error is not None:
+                error_msg = f"Ошибка при извлечении текста со страницы {page_num}: {page_error}"
+                print(f"  ⚠️  {error_msg}")
+            elif text and not text.isspace():
+                number = str(page_num)
+                header = _PAGE_HEADER_PREFIX + number.encode('ascii') + _PAGE_HEADER_SUFFIX
+                data = text.encode('utf-8', errors='replace')
+                # Если запись отстает от извлечения, ждем ее, чтобы очередь
+                # не накапливала в памяти весь документ
+                if len(writes) >= WRITE_QUEUE_PAGES:
+                    if writes[0].exception() is not None:
+                        # Ошибка записи пробрасывается ниже, после цикла
+                        break
+                    writes.popleft()
+                writes.append(writer.submit(f.writelines, (header, data, b"\n")))
+                page_lengths.append(_PAGE_HEADER_CHARS + len(number) + len(text) + 1)
+                page_sizes.append(len(header) + len(data) + 1)
+    
+    # Пробрасываем ошибки фоновой записи
+    for write in writes:
+        write.result()
+    
+    return page_lengths, page_sizes, total_pages, error_msg
+
+def new_stats() -> dict:
+    """
+    Создает пустой словарь статистики обработки.
+    """
+    return {
+        'processed': 0,
+        'errors': 0,
+        'scanned': 0,
+        'split': 0,
+        'total_chars': 0
+    }
+
+def merge_stats(stats: dict, other: dict) -> None:
+    """
+    Добавляет статистику одного файла к общей статистике.
+    """
+    for key, value in other.items():
+        stats[key] += value
+
+def process_pdf(pdf_file: Path, base_name: str, output_dir: Path, max_chars_per_part: int, min_parts: int, max_parts: int, page_workers: int = 1) -> tuple[dict, str]:
     """
     Обрабатывает один PDF файл.
+    Выполняется в отдельном процессе, поэтому возвращает собственную статистику
+    и собранный отчет о файле: главный процесс суммирует статистику и печатает
+    отчеты по порядку, не перемешивая строки разных файлов.
+    """
+    report = io.StringIO()
+    with contextlib.redirect_stdout(report):
+        stats = _process_pdf(pdf_file, base_name, output_dir, max_chars_per_part, min_parts, max_parts, page_workers)
+    return stats, report.getvalue()
+
+def _process_pdf(pdf_file: Path, base_name: str, output_dir: Path, max_chars_per_part: int, min_parts: int, max_parts: int, page_workers: int) -> dict:
     """
+    Открывает PDF, отсеивает сканированные документы и сохраняет текст остальных,
+    печатая ход обработки.
+    """
+    stats = new_stats()
     print(f"\n📄 Обработка: {pdf_file.name}")
     
-    full_text, total_pages, error_msg = extract_text_from_pdf(pdf_file)
-    
-    if error_msg and not full_text.strip():
-        print(f"  ❌ {error_msg}")
+    try:
+        doc, _ = _open_pdf_with_fallback(pdf_file)
+    except Exception as e:
+        print(f"  ❌ Ошибка при открытии PDF: {e}")
         stats['errors'] += 1
-        return
+        return stats
     
-    if not full_text.strip():
-        print(f"  ⚠️  Файл пустой или не содержит текста")
-        stats['empty'] += 1
-        return
+    with doc:
+        # Сканированные документы отсеиваем по нескольким страницам до полного разбора
+        try:
+            has_text = is_text_pdf(doc)
+        except Exception as e:
+            print(f"  ❌ Ошибка при открытии PDF: {e}")
+            stats['errors'] += 1
+            return stats
+        
+        if not has_text:
+            print(f"  ⚠️  PDF не содержит текста (возможно, это сканированное изображение), пропускаем")
+            stats['scanned'] += 1
+            return stats
+        
+        return _save_pdf_text(pdf_file, doc, base_name, output_dir, stats, max_chars_per_part, min_parts, max_parts, page_workers)
+
+def _save_pdf_text(pdf_file: Path, doc, base_name: str, output_dir: Path, stats: dict, max_chars_per_part: int, min_parts: int, max_parts: int, page_workers: int) -> dict:
+    """
+    Извлекает текст открытого PDF, в котором is_text_pdf нашла текст,
+    и сохраняет его одним файлом или частями.
+    """
+    txt_name = f"{base_name}.txt"
+    output_path = output_dir / txt_name
+    
+    # Текст сразу пишется на диск во временный файл; для маленьких документов
+    # он затем просто переименовывается, для больших - раскладывается по частям
+    spool_path = output_dir / f"{txt_name}.tmp"
+    try:
+        page_lengths, page_sizes, total_pages, error_msg = extract_text_to_file(pdf_file, doc, spool_path, page_workers)
+    except Exception as e:
+        # Текст извлечен не полностью - неполный файл не сохраняем
+        print(f"  ❌ Ошибка при извлечении текста: {e}")
+        stats['errors'] += 1
+        spool_path.unlink(missing_ok=True)
+        return stats
+    
+    # is_text_pdf уже нашла текст, поэтому пустой результат означает,
+    # что страницы с текстом не удалось извлечь
+    if not page_lengths:
+        spool_path.unlink(missing_ok=True)
+        print(f"  ❌ {error_msg or 'Не удалось извлечь текст ни с одной страницы'}")
+        stats['errors'] += 1
+        return stats
     
     # Определяем, нужно ли разделять документ
-    text_length = len(full_text)
+    text_length = sum(page_lengths)
     num_parts = determine_num_parts(text_length, max_chars_per_part, min_parts, max_parts)
     
-    # Очищаем имя файла
-    base_name = sanitize_filename(pdf_file.stem)
-    
-    if num_parts == 1:
+    # Страницы больше размера части дополнительно делятся по абзацам и строкам;
+    # частей получается столько, сколько удалось заполнить
+    parts = []
+    if num_parts > 1:
+        try:
+            with open(spool_path, 'rb') as src:
+                block_lengths, block_sizes = split_oversized_blocks(src, page_lengths, page_sizes, text_length / num_parts)
+        except Exception as e:
+            print(f"  ❌ Ошибка при разделении: {e}")
+            stats['errors'] += 1
+            spool_path.unlink(missing_ok=True)
+            return stats
+        points = split_points(block_lengths, num_parts)
+        parts = [(start, end) for start, end in zip(points, points[1:]) if start < end]
+        if len(parts) < 2:
+            print(f"  ⚠️  Документ большой ({text_length:,} символов), но его не на чем разделить (нет переносов строк)")
+    
+    if len(parts) < 2:
         # Сохраняем как один файл
-        txt_name = f"{base_name}.txt"
-        output_path = output_dir / txt_name
         try:
-            with open(output_path, 'w', encoding='utf-8', errors='replace') as f:
-                f.write(full_text)
+            os.replace(spool_path, output_path)
             print(f"  ✅ Сохранено: {txt_name}")
             print(f"     📊 Размер: {text_length:,} символов, {total_pages} страниц")
             stats['processed'] += 1
@@ -166,31 +495,35 @@ def process_pdf(pdf_file: Path, output_dir: Path, stats: dict, max_chars_per_par
         except Exception as e:
             print(f"  ❌ Ошибка при сохранении: {e}")
             stats['errors'] += 1
+            spool_path.unlink(missing_ok=True)
     else:
-        # Разделяем на части
-        print(f"  📦 Документ большой ({text_length:,} символов), разделяем на {num_parts} части...")
-        parts = split_text_into_parts(full_text, num_parts)
+        # Разделяем на части по границам страниц, а при необходимости - абзацев и строк
+        print(f"  📦 Документ большой ({text_length:,} символов), разделяем на {len(parts)} части...")
         
         saved_parts = 0
-        for part_num, part_text in enumerate(parts, 1):
-            if not part_text.strip():
-                continue
-                
-            txt_name = f"{base_name}_часть{part_num}_из{num_parts}.txt"
-            output_path = output_dir / txt_name
-            try:
-                with open(output_path, 'w', encoding='utf-8', errors='replace') as f:
-                    f.write(part_text)
-                print(f"  ✅ Сохранено: {txt_name} ({len(part_text):,} символов)")
-                saved_parts += 1
-                stats['total_chars'] += len(part_text)
-            except Exception as e:
-                print(f"  ❌ Ошибка при сохранении части {part_num}: {e}")
+        with open(spool_path, 'rb', buffering=WRITE_BUFFER_SIZE) as src:
+            for part_num, (start, end) in enumerate(parts, 1):
+                txt_name = f"{base_name}_часть{part_num}_из{len(parts)}.txt"
+                output_path = output_dir / txt_name
+                part_chars = sum(block_lengths[start:end])
+                try:
+                    src.seek(sum(block_sizes[:start]))
+                    with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                        for size in block_sizes[start:end]:
+                            f.write(src.read(size))
+                    print(f"  ✅ Сохранено: {txt_name} ({part_chars:,} символов)")
+                    saved_parts += 1
+                    stats['total_chars'] += part_chars
+                except Exception as e:
+                    print(f"  ❌ Ошибка при сохранении части {part_num}: {e}")
+        spool_path.unlink(missing_ok=True)
         
         if saved_parts > 0:
             stats['processed'] += 1
             stats['split'] += 1
             print(f"     📊 Всего частей: {saved_parts}, {total_pages} страниц")
+    
+    return stats
 
 def main():
     """
@@ -279,17 +612,27 @@ def main():
     print(f"📁 Результаты будут сохранены в: {output_dir.absolute()}")
     
     # Статистика обработки
-    stats = {
-        'processed': 0,
-        'errors': 0,
-        'empty': 0,
-        'split': 0,
-        'total_chars': 0
-    }
-    
-    # Обрабатываем каждый PDF
-    for pdf_file in pdf_files:
-        process_pdf(pdf_file, output_dir, stats, max_chars_per_part, min_parts, max_parts)
+    stats = new_stats()
+    
+    # Обрабатываем PDF параллельно: каждый файл независим и открывается
+    # заново в своем процессе (объекты pdfplumber нельзя передавать между процессами).
+    # Если файлов меньше, чем ядер, свободные ядра отдаются под извлечение страниц.
+    max_workers = min(_get_max_workers(), len(pdf_files))
+    worker = partial(
+        process_pdf,
+        output_dir=output_dir,
+        max_chars_per_part=max_chars_per_part,
+        min_parts=min_parts,
+        max_parts=max_parts,
+        page_workers=max(1, _get_max_workers() // max_workers)
+    )
+    # Файлы раздаются пачками, чтобы процессы переиспользовались для многих
+    # маленьких PDF и накладные расходы на передачу задач амортизировались
+    chunksize = max(1, len(pdf_files) // (4 * max_workers))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for file_stats, report in executor.map(worker, pdf_files, build_output_names(pdf_files), chunksize=chunksize):
+            print(report, end='')
+            merge_stats(stats, file_stats)
     
     # Выводим итоговую статистику
     print("\n" + "="*60)
@@ -298,8 +641,8 @@ def main():
     print(f"✅ Успешно обработано: {stats['processed']}")
     if stats['split'] > 0:
         print(f"📦 Разделено на части: {stats['split']}")
-    if stats['empty'] > 0:
-        print(f"⚠️  Пустых файлов: {stats['empty']}")
+    if stats['scanned'] > 0:
+        print(f"🖼️  Сканированных файлов (пропущено): {stats['scanned']}")
     if stats['errors'] > 0:
         print(f"❌ Ошибок: {stats['errors']}")
     print(f"📝 Всего символов извлечено: {stats['total_chars']:,}")